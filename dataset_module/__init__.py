@@ -1,3 +1,3 @@
-from .fasta_dataset import FastaDataset, FastaContent
+from .fasta_dataset import FastaDataset, FastaContent, list_fasta_paths
 
-__all__ = [FastaContent, FastaDataset]
\ No newline at end of file
+__all__ = [FastaContent, FastaDataset, list_fasta_paths]
\ No newline at end of file
@@ -1,7 +1,65 @@
 import os, re
+from concurrent.futures import ProcessPoolExecutor
 from typing import Iterator, Union
 from utils import parse_fasta_to_sequences
 
+
+def _parse_one(path: str) -> tuple[str, list[str]]:
+    """
+    Read and parse a single FASTA file (top-level so it pickles for
+    ProcessPoolExecutor workers).
+    """
+    with open(path, 'r') as file:
+        return path, parse_fasta_to_sequences(file)
+
+
+# Compiled numeric-extraction patterns, built lazily, one per prefix
+# (e.g. 'test' -> r"test(\d+)")
+_NUM_PATTERNS: dict[str, re.Pattern] = {}
+
+
+def _number_pattern(prefix: str) -> re.Pattern:
+    pattern = _NUM_PATTERNS.get(prefix)
+    if pattern is None:
+        pattern = _NUM_PATTERNS[prefix] = re.compile(rf"{re.escape(prefix)}(\d+)")
+    return pattern
+
+
+def list_fasta_paths(folder: str, prefix: str = "test") -> list[str]:
+    """
+    Scan a folder once with os.scandir and return the paths of its
+    '<prefix><N>.fasta' files in natural (numeric-suffix) order, so e.g.
+    test2.fasta sorts before test10.fasta. This is the single listing
+    used by both FastaDataset and the benchmarking scripts.
+    """
+    # scandir caches name/type per entry, so the prefix/extension filter
+    # runs without extra stat or basename calls per file.
+    with os.scandir(folder) as it:
+        entries = [
+            (entry.name, entry.path)
+            for entry in it
+            if entry.is_file(follow_symlinks=False)
+            and entry.name.startswith(prefix)
+            and entry.name.endswith(".fasta")
+        ]
+
+    # Fast path: the filtered names all start with the prefix, so the
+    # number is usually a plain slice + int parse; the precompiled regex
+    # only runs for names with extra text around the number.
+    num_re = _number_pattern(prefix)
+    prefix_len = len(prefix)
+
+    def sort_key(entry):
+        stem = entry[0][prefix_len:].split('.', 1)[0]
+        if stem.isdigit():
+            return int(stem)
+        match = num_re.search(entry[0])
+        return int(match.group(1)) if match else -1
+
+    entries.sort(key=sort_key)
+
+    return [entry_path for _, entry_path in entries]
+
 class FastaContent:
     """
     This object represents a fasta's file content.
@@ -19,14 +77,36 @@ class FastaContent:
     """
     @staticmethod
     def __parse_fasta_file(path: str):
+        # Stream the open file to the parser instead of read()-ing it
+        # whole, so peak memory stays at one sequence buffer per record
         with open(path, 'r') as file:
-            content = file.read()
-
-        return parse_fasta_to_sequences(content)
+            return parse_fasta_to_sequences(file)
     
     def __init__(self, path: str):
         self.__path = path
-        self.__sequences: list[str] = self.__parse_fasta_file(path)
+        self.__sequences: list[str] | None = None
+
+    @classmethod
+    def _from_parsed(cls, path: str, sequences: list[str]) -> "FastaContent":
+        """
+        Build a FastaContent around sequences that were already parsed
+        (e.g. in a worker process), skipping the lazy file read.
+        """
+        content = cls.__new__(cls)
+        content.__path = path
+        content.__sequences = sequences
+        return content
+
+    @classmethod
+    def _from_trusted(cls, path: str) -> "FastaContent":
+        """
+        Fast-path constructor for paths already vetted by `FastaDataset`,
+        skipping any validation added to `__init__` in the future.
+        """
+        content = cls.__new__(cls)
+        content.__path = path
+        content.__sequences = None
+        return content
 
     @property
     def path(self) -> str:
@@ -34,6 +114,10 @@ class FastaContent:
 
     @property
     def sequences(self) -> list[str]:
+        # Parse lazily on first access so that iterating a dataset for
+        # metadata (e.g. names) does not read every file.
+        if self.__sequences is None:
+            self.__sequences = self.__parse_fasta_file(self.__path)
         return self.__sequences
     
     @property
@@ -49,52 +133,92 @@ class FastaDataset:
     a list of `FastaContent`.
     """
 
-    @staticmethod
-    def __extract_number(filename: str, prefix: str) -> int:
-        """
-        Estrae la prima sequenza numerica dopo il prefix.
-        Es: 'test12.fasta' → 12
-        """
-        match = re.search(rf"{re.escape(prefix)}(\d+)", filename)
-        return int(match.group(1)) if match else -1
-
-
     def __init__(self, path: str, prefix: str = "test"):
         self.__path = path
         self.__prefix = prefix
         self.__name = os.path.basename(path)
 
-        self.__fasta_paths = [
-            os.path.join(self.__path, f)
-            for f in os.listdir(self.__path)
-            if f.startswith(self.__prefix) and f.endswith(".fasta")
-        ]
+        # The scandir pass is deferred to the first access, so constructing
+        # a dataset (e.g. just to hand it to a worker) costs nothing
+        self.__fasta_paths: list[str] | None = None
+
+        # Shares one (lazily parsed) FastaContent per index across
+        # repeated __getitem__ calls, so each file is parsed at most once
+        self.__content_cache: dict[int, FastaContent] = {}
+
+    def __ensure_loaded(self):
+        """
+        List the folder on first use (single scandir pass, sorted by the
+        number after the prefix, es: 'test12.fasta' → 12).
+        """
+        if self.__fasta_paths is None:
+            self.__fasta_paths = list_fasta_paths(self.__path, self.__prefix)
 
-        # Ordina usando il numero dopo il prefisso
-        self.__fasta_paths.sort(
-            key=lambda f: self.__extract_number(os.path.basename(f), self.__prefix))
 
+    @classmethod
+    def from_paths(cls, paths: list[str], name: str = None, prefix: str = "test") -> "FastaDataset":
+        """
+        Build a dataset directly from an already-listed (and ordered) list
+        of fasta paths, skipping the directory scan and sort. Intended for
+        trusted sources such as worker processes that receive the path list
+        from a dataset constructed in the parent.
+        """
+        dataset = cls.__new__(cls)
+        dataset.__path = os.path.dirname(paths[0]) if paths else ""
+        dataset.__prefix = prefix
+        dataset.__name = name if name is not None else os.path.basename(dataset.__path)
+        dataset.__fasta_paths = list(paths)
+        dataset.__content_cache = {}
+        return dataset
 
     def __iter__(self) -> Iterator[FastaContent]:
+        self.__ensure_loaded()
         for fasta_path in self.__fasta_paths:
-            yield FastaContent(fasta_path)
+            yield FastaContent._from_trusted(fasta_path)
 
     def __getitem__(self, index: Union[int, slice]) -> Union[FastaContent, list[FastaContent]]:
+        self.__ensure_loaded()
         if isinstance(index, int):
             if index < 0:
                 index += len(self.__fasta_paths)
             if index < 0 or index >= len(self.__fasta_paths):
                 raise IndexError("Index out of range")
-            return FastaContent(self.__fasta_paths[index])
-        
+            if index not in self.__content_cache:
+                self.__content_cache[index] = FastaContent._from_trusted(self.__fasta_paths[index])
+            return self.__content_cache[index]
+
         elif isinstance(index, slice):
-            sliced_paths = self.__fasta_paths[index]
-            return [FastaContent(path) for path in sliced_paths]
+            indices = range(*index.indices(len(self.__fasta_paths)))
+            return [self[i] for i in indices]
 
         else:
             raise TypeError("Invalid argument type")
 
+    def parse_all(self, n_workers: int = None) -> list[FastaContent]:
+        """
+        Read and parse every file of the dataset in parallel, returning the
+        corresponding FastaContent objects (already populated) in order.
+
+        Parsing is spread over a process pool with a chunksize that
+        amortizes the IPC cost; the parsed contents are also stored in the
+        dataset cache so later indexing reuses them.
+        """
+        self.__ensure_loaded()
+        n_workers = n_workers or os.cpu_count() or 1
+        chunksize = max(1, len(self.__fasta_paths) // (4 * n_workers))
+
+        contents = []
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = executor.map(_parse_one, self.__fasta_paths, chunksize=chunksize)
+            for index, (path, sequences) in enumerate(results):
+                content = FastaContent._from_parsed(path, sequences)
+                self.__content_cache[index] = content
+                contents.append(content)
+
+        return contents
+
     def __len__(self) -> int:
+        self.__ensure_loaded()
         return len(self.__fasta_paths)
 
     @property
@@ -107,4 +231,5 @@ class FastaDataset:
 
     @property
     def fasta_files(self) -> list[str]:
+        self.__ensure_loaded()
         return self.__fasta_paths
@@ -0,0 +1,500 @@
+import heapq
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Tuple, Union
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional: fall back to the numpy path
+    njit = None
+
+"""
+OrthoDB Dataset Preparation Utilities
+
+This script provides the low-level helpers used to turn raw OrthoDB FASTA
+dumps into datasets suitable for GA-DPAMSA training and inference:
+- Streaming FASTA parsing for multi-MB genome files.
+- Bulk nucleotide statistics over whole datasets.
+- Resolution of IUPAC ambiguity codes into concrete bases.
+
+Author: https://github.com/FLaTNNBio/GA-DPAMSA
+"""
+
+# IUPAC ambiguity codes and the concrete bases each one can stand for
+AMBIGUOUS_NUCLEOTIDES = {
+    'R': 'AG',
+    'Y': 'CT',
+    'S': 'CG',
+    'W': 'AT',
+    'K': 'GT',
+    'M': 'AC',
+    'B': 'CGT',
+    'D': 'AGT',
+    'H': 'ACT',
+    'V': 'ACG',
+    'N': 'ACGT',
+}
+
+# Translation table that upper-cases the four nucleotide codes in one
+# C-level pass; every other byte is left untouched.
+_UPPER_LUT = bytes.maketrans(b'acgt', b'ACGT')
+
+# Output buffered in write_fasta before each write() syscall
+_WRITE_FLUSH_BYTES = 1 << 20  # 1 MB
+
+
+def iter_fasta_files(input_dir: Union[str, Path],
+                     patterns: Tuple[str, ...] = ('*.fasta', '*.fa', '*.fna')) -> Iterator[Path]:
+    """
+    Yield the FASTA files of a directory, sorted and without duplicates.
+
+    Each pattern is globbed separately (fast C-level scandir) and already
+    yields unique paths, so instead of sorted(set(...)) — which hashes
+    every Path and re-sorts the union — the per-pattern sorted lists are
+    merged lazily with heapq.merge and deduplicated by comparing each path
+    against the previous one: a single O(N) pass with no Path hashing.
+
+    Parameters:
+    -----------
+    - input_dir (str or Path): Directory to scan.
+    - patterns (tuple of str): Glob patterns identifying FASTA files.
+
+    Yields:
+    -------
+    - Path: Each matching file, in sorted order.
+    """
+    iters = [sorted(Path(input_dir).glob(pattern)) for pattern in patterns]
+
+    prev = None
+    for path in heapq.merge(*iters):
+        if path != prev:
+            yield path
+        prev = path
+
+
+def read_fasta(path: Union[str, Path]) -> Iterator[Tuple[str, str]]:
+    """
+    Stream the records of a FASTA file as (header, sequence) pairs.
+
+    The file is read line by line in binary mode and each sequence is
+    accumulated in a single bytearray, so no intermediate per-line string
+    list is built. Whitespace inside a record (spaces, tabs, CR/LF) is
+    removed with one C-level bytes.translate pass when the record is
+    flushed, instead of join + repeated str.replace scans.
+
+    Parameters:
+    -----------
+    - path (str or Path): Path to the FASTA file to read.
+
+    Yields:
+    -------
+    - tuple (str, str): The record header (without the leading '>') and its
+                        sequence as a continuous string.
+
+    Example:
+    --------
+    >>> list(read_fasta("records.fasta"))
+    [('seq1', 'ATCGGCTA'), ('seq2', 'TTAGCCCTA')]
+    """
+    header = None
+    seq_buf = bytearray()
+
+    with Path(path).open('rb') as file:
+        for line in file:
+            if line.startswith(b'>'):
+                # Flush the previous record before starting a new one
+                if header is not None:
+                    yield header, bytes(seq_buf).translate(None, b' \t\r\n').decode('ascii')
+                header = line[1:].strip().decode('utf-8', errors='replace')
+                seq_buf.clear()
+            else:
+                seq_buf.extend(line)
+
+        # Flush the last record, if any
+        if header is not None:
+            yield header, bytes(seq_buf).translate(None, b' \t\r\n').decode('ascii')
+
+
+def write_fasta(records: Iterable[Tuple[str, str]], path: Union[str, Path], width: int = 60):
+    """
+    Write (header, sequence) records to a FASTA file, wrapping sequences
+    at `width` characters per line.
+
+    The output is assembled in a bytearray and flushed to the binary-mode
+    file roughly every megabyte, so a 100k-line output costs a handful of
+    write() calls instead of one text-mode write (encoder + buffer lock)
+    per line.
+
+    Parameters:
+    -----------
+    - records (iterable of (str, str)): The records to write.
+    - path (str or Path): Destination FASTA file (overwritten).
+    - width (int): Maximum sequence line length.
+    """
+    buf = bytearray()
+
+    with Path(path).open('wb') as file:
+        for header, seq in records:
+            buf += b'>'
+            buf += header.encode('utf-8')
+            buf += b'\n'
+
+            seq_bytes = seq.encode('ascii')
+            for i in range(0, len(seq_bytes), width):
+                buf += seq_bytes[i:i + width]
+                buf += b'\n'
+
+            # Cap memory on very large outputs
+            if len(buf) >= _WRITE_FLUSH_BYTES:
+                file.write(buf)
+                buf.clear()
+
+        if buf:
+            file.write(buf)
+
+
+def make_unique_records(records: Iterable[Tuple[str, str]]) -> list:
+    """
+    Drop records whose sequence was already seen, keeping first occurrences.
+
+    Relies on the insertion-order guarantee of plain dicts (CPython 3.7+):
+    a single setdefault per record both deduplicates and remembers the
+    first header, so each sequence is hashed exactly once and no
+    OrderedDict rebuild pass is needed.
+
+    Parameters:
+    -----------
+    - records (iterable of (str, str)): (header, sequence) pairs.
+
+    Returns:
+    --------
+    - list of (str, str): The records with duplicate sequences removed,
+                          in first-seen order.
+    """
+    seen: Dict[str, str] = {}
+    for header, seq in records:
+        seen.setdefault(seq, header)
+
+    return [(header, seq) for seq, header in seen.items()]
+
+
+def find_duplicate_sequences(records: Iterable[Tuple[str, str]]) -> Dict[str, int]:
+    """
+    Report the sequences that appear more than once and how often.
+
+    The Counter is fed a generator instead of an intermediate list, so the
+    records are consumed without materializing a second pointer list, and
+    the result is collected from most_common() — which is sorted by
+    descending count, letting the scan stop at the first singleton.
+
+    Parameters:
+    -----------
+    - records (iterable of (str, str)): (header, sequence) pairs.
+
+    Returns:
+    --------
+    - dict: Mapping of each duplicated sequence to its occurrence count,
+            in descending count order.
+    """
+    counter = Counter(seq for _, seq in records)
+
+    duplicates = {}
+    for seq, count in counter.most_common():
+        if count <= 1:
+            break
+        duplicates[seq] = count
+
+    return duplicates
+
+
+def compute_base_distribution(sequences: Iterable[Union[str, bytes]]) -> Dict[str, int]:
+    """
+    Count the occurrences of each nucleotide (A, C, G, T) across sequences.
+
+    Instead of iterating the sequences character by character in Python,
+    each sequence is converted to bytes once, case-folded with a single
+    bytes.translate pass, and counted with four bytes.count calls that run
+    in optimized C — one memory pass per base rather than a Python-level
+    loop with per-character upper/dict lookups.
+
+    Parameters:
+    -----------
+    - sequences (iterable of str or bytes): The sequences to analyze.
+                                            Sequences already provided as
+                                            bytes skip the encode step.
+
+    Returns:
+    --------
+    - dict: Mapping of 'A', 'C', 'G', 'T' to their total occurrence counts.
+
+    Example:
+    --------
+    >>> compute_base_distribution(['ATCg', 'aacg'])
+    {'A': 3, 'C': 2, 'G': 2, 'T': 1}
+    """
+    counts = {'A': 0, 'C': 0, 'G': 0, 'T': 0}
+
+    for seq in sequences:
+        if isinstance(seq, str):
+            seq = seq.encode('ascii', 'ignore')
+        for base, count in compute_base_distribution_bytes(seq).items():
+            counts[base] += count
+
+    return counts
+
+
+def compute_base_distribution_bytes(buf: bytes) -> Dict[str, int]:
+    """
+    Count the nucleotides of an entire byte buffer in one shot.
+
+    Callers that already hold many sequences as a single concatenated
+    bytes blob (separators are harmless since they never collide with
+    A/C/G/T) can count the whole dataset with one case-fold pass and four
+    bytes.count scans, with no Python-level iteration over the records.
+
+    Parameters:
+    -----------
+    - buf (bytes): Raw sequence bytes, possibly spanning several records.
+
+    Returns:
+    --------
+    - dict: Mapping of 'A', 'C', 'G', 'T' to their occurrence counts.
+    """
+    upper = buf.translate(_UPPER_LUT)
+
+    return {
+        'A': upper.count(b'A'),
+        'C': upper.count(b'C'),
+        'G': upper.count(b'G'),
+        'T': upper.count(b'T'),
+    }
+
+
+def build_weight_table(base_probs: Tuple[float, float, float, float]
+                       ) -> Dict[str, Tuple[str, Tuple[float, ...]]]:
+    """
+    Precompute, for every ambiguous symbol, its candidate bases and their
+    normalized substitution weights under the given background probabilities.
+
+    Building this dict once per base_probs and passing it around replaces
+    the per-call memoized lookup (hash of the probability tuple plus a
+    locked cache probe) with a plain dict access.
+
+    Parameters:
+    -----------
+    - base_probs (tuple of 4 floats): Background probabilities of A, C, G, T.
+
+    Returns:
+    --------
+    - dict: Mapping of each ambiguity symbol to (bases, weights).
+    """
+    base_probs = tuple(base_probs)
+    table = {}
+
+    for symbol, bases in AMBIGUOUS_NUCLEOTIDES.items():
+        raw = [base_probs['ACGT'.index(base)] for base in bases]
+        total = sum(raw)
+        if total == 0:
+            # Degenerate background: fall back to a uniform draw
+            weights = tuple(1 / len(bases) for _ in bases)
+        else:
+            weights = tuple(weight / total for weight in raw)
+        table[symbol] = (bases, weights)
+
+    return table
+
+
+def resolve_ambiguous_sequence(seq: str,
+                               base_probs: Tuple[float, float, float, float] = (0.25, 0.25, 0.25, 0.25),
+                               rng: np.random.Generator = None,
+                               weight_table: Dict[str, Tuple[str, Tuple[float, ...]]] = None) -> str:
+    """
+    Replace every IUPAC ambiguity code in a sequence with a concrete base.
+
+    The sequence is viewed as a numpy uint8 array and each ambiguous symbol
+    class is resolved with a single vectorized rng.choice draw over all of
+    its occurrences at once — at most one RNG call per symbol class (11)
+    instead of one Python-level random call per ambiguous character.
+    Lower-case symbols are replaced with lower-case bases.
+
+    Parameters:
+    -----------
+    - seq (str): The nucleotide sequence, possibly containing ambiguity codes.
+    - base_probs (tuple of 4 floats): Background probabilities of A, C, G, T
+                                      used to weight the substitutions.
+    - rng (np.random.Generator, optional): Source of randomness; a fresh
+                                           default_rng() is used when omitted.
+    - weight_table (dict, optional): Precomputed build_weight_table result;
+                                     callers resolving many sequences should
+                                     build it once and pass it in.
+
+    Returns:
+    --------
+    - str: The sequence with all ambiguity codes substituted.
+
+    Example:
+    --------
+    >>> resolve_ambiguous_sequence('ATRNCy')
+    'ATGACc'  # (random: R→A/G, N→A/C/G/T, y→c/t)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if weight_table is None:
+        weight_table = build_weight_table(base_probs)
+
+    resolved = np.frombuffer(seq.encode('ascii'), dtype=np.uint8).copy()
+
+    for symbol in AMBIGUOUS_NUCLEOTIDES:
+        # Match both cases of the symbol in one vectorized comparison
+        mask = (resolved == ord(symbol)) | (resolved == ord(symbol.lower()))
+        count = int(mask.sum())
+        if count == 0:
+            continue
+
+        bases, weights = weight_table[symbol]
+        picks = rng.choice(np.frombuffer(bases.encode('ascii'), dtype=np.uint8),
+                           size=count, p=weights)
+
+        # Preserve the case of the original symbol (ASCII bit 0x20)
+        picks = picks.astype(np.uint8) | (resolved[mask] & 0x20)
+        resolved[mask] = picks
+
+    return resolved.tobytes().decode('ascii')
+
+
+def random_cut_lengths(orig_lens: np.ndarray, K: int, H: int,
+                       rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Draw the cut length for a whole batch of sequences in one RNG call.
+
+    Sequences no longer than the target window K pass through unchanged;
+    the others get a uniform draw in [max(1, K - H), min(K, orig_len)].
+    A single vectorized rng.integers call produces every cut, amortizing
+    the PRNG overhead that a per-sequence randint loop would pay.
+
+    Parameters:
+    -----------
+    - orig_lens (np.ndarray): Original sequence lengths.
+    - K (int): Target window length.
+    - H (int): Allowed slack below K.
+    - rng (np.random.Generator, optional): Source of randomness; a fresh
+                                           default_rng() is used when omitted.
+
+    Returns:
+    --------
+    - np.ndarray: The cut length for each input sequence.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    orig_lens = np.asarray(orig_lens)
+    min_len = max(1, K - H)
+    max_len = np.minimum(K, orig_lens)
+    lo = np.minimum(min_len, max_len)
+
+    draws = rng.integers(lo, max_len + 1)
+    return np.where(orig_lens <= K, orig_lens, draws)
+
+
+def random_cut_length(orig_len: int, K: int, H: int,
+                      rng: np.random.Generator = None) -> int:
+    """
+    Single-sequence convenience wrapper around random_cut_lengths; prefer
+    the batched variant when cutting many sequences.
+    """
+    return int(random_cut_lengths(np.asarray([orig_len]), K, H, rng)[0])
+
+
+@lru_cache(maxsize=None)
+def _resolution_tables(base_probs_tuple: Tuple[float, float, float, float]):
+    """
+    Build the 256-row lookup tables used by the native resolution kernel:
+    cumulative substitution weights and candidate base bytes per ASCII code.
+    Rows of non-ambiguous codes are left at zero so the kernel skips them.
+    """
+    cum = np.zeros((256, 4), dtype=np.float32)
+    bases_table = np.zeros((256, 4), dtype=np.uint8)
+    weight_table = build_weight_table(base_probs_tuple)
+
+    for symbol in AMBIGUOUS_NUCLEOTIDES:
+        bases, weights = weight_table[symbol]
+        row = ord(symbol)
+        total = 0.0
+        for idx in range(4):
+            if idx < len(bases):
+                total += weights[idx]
+                bases_table[row, idx] = ord(bases[idx])
+            else:
+                # Pad so the cumulative row always reaches 1.0
+                bases_table[row, idx] = bases_table[row, idx - 1]
+            cum[row, idx] = total if idx < len(bases) else 1.0
+        cum[row, 3] = 1.0
+
+    return cum, bases_table
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _resolve_kernel(a, cum, bases_table):
+        for i in range(a.shape[0]):
+            code = a[i]
+            up = code & 0xDF  # upper-case the ASCII letter
+            if cum[up, 3] > 0.0:
+                r = np.random.random()
+                idx = 0
+                while cum[up, idx] < r:
+                    idx += 1
+                a[i] = bases_table[up, idx] | (code & 0x20)
+
+    @njit(cache=True)
+    def _seed_kernel(seed):
+        np.random.seed(seed)
+
+else:
+    _resolve_kernel = None
+    _seed_kernel = None
+
+
+def resolve_ambiguous_sequences(seqs: Iterable[str],
+                                base_probs: Tuple[float, float, float, float] = (0.25, 0.25, 0.25, 0.25),
+                                seed: int = None) -> list:
+    """
+    Resolve IUPAC ambiguity codes across a whole batch of sequences.
+
+    When Numba is available the per-character loop runs as a compiled
+    kernel: each byte is checked against a precomputed 256x4 cumulative
+    weight table and substituted in place with a native uniform draw,
+    collapsing the Python call stack entirely. Without Numba this falls
+    back to the vectorized numpy path, one sequence at a time.
+
+    Parameters:
+    -----------
+    - seqs (iterable of str): The sequences to resolve.
+    - base_probs (tuple of 4 floats): Background probabilities of A, C, G, T.
+    - seed (int, optional): Seed for the kernel's internal PRNG state.
+
+    Returns:
+    --------
+    - list of str: The resolved sequences, in input order.
+    """
+    if _resolve_kernel is None:
+        rng = np.random.default_rng(seed)
+        weight_table = build_weight_table(base_probs)
+        return [resolve_ambiguous_sequence(seq, base_probs, rng, weight_table) for seq in seqs]
+
+    if seed is not None:
+        _seed_kernel(seed)
+
+    cum, bases_table = _resolution_tables(tuple(base_probs))
+
+    resolved = []
+    for seq in seqs:
+        buf = np.frombuffer(seq.encode('ascii'), dtype=np.uint8).copy()
+        _resolve_kernel(buf, cum, bases_table)
+        resolved.append(buf.tobytes().decode('ascii'))
+
+    return resolved
@@ -4,7 +4,7 @@ from tqdm import tqdm
 import config
 import utils
 
-from dataset_module import FastaDataset
+from dataset_module import FastaDataset, list_fasta_paths
 
 """
 Benchmarking Script for MSA Methods
@@ -36,6 +36,17 @@ GA_DPAMSA_MODEL = 'model_3x30'
 from concurrent.futures import ProcessPoolExecutor, as_completed
 
 
+def _preload():
+    """
+    Pool initializer: import the heavy inference stacks (torch, the DPAMSA
+    network and GA pipeline) once per worker at pool start-up, so the tasks
+    dispatched to a worker find the modules already warm instead of paying
+    the import cost at first use.
+    """
+    import mainGA  # noqa: F401
+    import DPAMSA.main  # noqa: F401
+
+
 def _run_external_tool(tool_name, file_paths, dataset_name):
     """
     Helper function executed in a separate process for each external tool.
@@ -46,20 +57,22 @@ def _run_external_tool(tool_name, file_paths, dataset_name):
     return tool_name, csv_path
 
 
-def _run_ga_dpamsa_worker(dataset_path, model_name):
+def _run_ga_dpamsa_worker(fasta_paths, model_name):
     """
     Worker process for GA-DPAMSA.
+    Receives the already-listed fasta paths from the parent process.
     """
-    dataset = FastaDataset(dataset_path)
+    dataset = FastaDataset.from_paths(fasta_paths)
     csv_path = utils.run_ga_dpamsa_inference('sp', dataset, model_name)
     return "GA-DPAMSA", csv_path
 
 
-def _run_dpamsa_worker(dataset_path, model_name):
+def _run_dpamsa_worker(fasta_paths, model_name):
     """
     Worker process for DPAMSA.
+    Receives the already-listed fasta paths from the parent process.
     """
-    dataset = FastaDataset(dataset_path)
+    dataset = FastaDataset.from_paths(fasta_paths)
     csv_path = utils.run_dpamsa_inference(dataset, model_name)
     return "DPAMSA", csv_path
 
@@ -77,36 +90,33 @@ def main():
     # Display selection menu
     choice = utils.display_menu()
 
-    # Paths
+    # Paths: list the dataset once, in natural order, and share the result
+    # with every worker (FastaDataset-based and external tools alike)
     dataset_folder = os.path.join(config.FASTA_FILES_PATH, DATASET_NAME)
-    dataset_path = os.path.join(config.FASTA_FILES_PATH, DATASET_NAME)
-    file_paths = [os.path.join(dataset_folder, file) for file in sorted(os.listdir(dataset_folder))]
+    fasta_paths = list_fasta_paths(dataset_folder)
 
     # Dictionary to store CSV paths for each tool
     tool_csv_paths = {}
 
     # Costruiamo la lista di job da lanciare in parallelo
-    jobs = []
-
-    with ProcessPoolExecutor() as executor:
-        # GA-DPAMSA
-        jobs.append(
-            executor.submit(_run_ga_dpamsa_worker, dataset_path, GA_DPAMSA_MODEL)
-        )
-
-        # DPAMSA if choice is 1 or 3
-        if choice == 1 or choice == 3:
-            jobs.append(
-                executor.submit(_run_dpamsa_worker, dataset_path, DPAMSA_MODEL)
-            )
-
-        # External tools for choice 2 or 3
-        if choice == 2 or choice == 3:
-            tools = list(config.TOOLS.keys())
-            for tool_name in tools:
-                jobs.append(
-                    executor.submit(_run_external_tool, tool_name, file_paths, DATASET_NAME)
-                )
+    # (GA-DPAMSA is always executed)
+    job_specs = [(_run_ga_dpamsa_worker, (fasta_paths, GA_DPAMSA_MODEL))]
+
+    # DPAMSA if choice is 1 or 3
+    if choice == 1 or choice == 3:
+        job_specs.append((_run_dpamsa_worker, (fasta_paths, DPAMSA_MODEL)))
+
+    # External tools for choice 2 or 3
+    if choice == 2 or choice == 3:
+        for tool_name in config.TOOLS.keys():
+            job_specs.append((_run_external_tool, (tool_name, fasta_paths, DATASET_NAME)))
+
+    # Size the pool to the actual job count instead of the default
+    # os.cpu_count(), and warm the heavy imports once per worker
+    max_workers = min(len(job_specs), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_preload) as executor:
+        jobs = [executor.submit(worker, *args) for worker, args in job_specs]
 
         # Progress tracking
         for future in tqdm(as_completed(jobs), total=len(jobs), desc="Running benchmarks"):
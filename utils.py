@@ -515,14 +515,16 @@ def calculate_metrics(env):
 
 def parse_fasta_to_sequences(fasta_content):
     """
-    Extract sequences from a FASTA-formatted string.
+    Extract sequences from FASTA-formatted content.
 
     This function processes a FASTA file/string, extracting and concatenating sequences
-    while ignoring headers (lines starting with '>').
+    while ignoring headers (lines starting with '>'). Passing an open file (or any
+    iterable of lines) streams the content without ever holding the whole file in memory.
 
     Parameters:
     -----------
-    - fasta_content (str): The content of a FASTA file as a single string.
+    - fasta_content (str or iterable of str): The content of a FASTA file, either as a
+                                              single string or as an iterable of lines.
 
     Returns:
     --------
@@ -542,8 +544,11 @@ def parse_fasta_to_sequences(fasta_content):
     sequences = []  # Stores extracted sequences
     current_sequence = []  # Remove leading/trailing whitespace
 
+    # Accept both a whole string and a stream of lines
+    lines = fasta_content.splitlines() if isinstance(fasta_content, str) else fasta_content
+
     # Process each line in the FASTA file
-    for line in fasta_content.splitlines():
+    for line in lines:
         line = line.strip()  # Remove leading/trailing whitespace
 
         if line.startswith(">"):  # Sequence identifier line